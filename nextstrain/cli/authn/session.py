@@ -17,7 +17,7 @@ from threading import Thread
 from typing import Any, Dict, Mapping, Optional, Set
 
 from ..aws.cognito.srp import CognitoSRP
-from ..browser import BROWSER, open_browser
+from ..browser import get_browser, open_browser
 from ..debug import debug
 from ..errors import UserError
 from ..net import is_loopback
@@ -403,7 +403,7 @@ class OpenIDSession(Session):
             server_thread = Thread(target = auth_response_server.serve_forever, daemon = True)
             server_thread.start()
 
-            print("Automatically opening" if BROWSER else "Please visit", "the following URL in your web browser:")
+            print("Automatically opening" if get_browser() else "Please visit", "the following URL in your web browser:")
             print()
             print(f"  {auth_url}")
             print()
@@ -445,7 +445,7 @@ class OpenIDSession(Session):
             input_thread = Thread(target = input_reader, daemon = True)
             input_thread.start()
 
-            if BROWSER:
+            if get_browser():
                 open_browser(auth_url)
 
             # Block until one of the threads exits.
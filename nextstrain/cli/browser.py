@@ -15,22 +15,32 @@ Web browser interaction.
     are not other means of doing so.
 """
 import webbrowser
+from functools import lru_cache
 from threading import Thread, ThreadError
 from os import environ
-from typing import Union
+from typing import Optional, Union
 from .url import URL
 from .util import warn
 
 
-if environ.get("NOBROWSER"):
-    BROWSER = None
-else:
+@lru_cache(maxsize = None)
+def get_browser() -> Optional[webbrowser.BaseBrowser]:
+    """
+    Returns the web browser to use, or None if no browser is available.
+
+    Browser detection may search ``PATH`` and run subprocesses, so it's
+    deferred until first needed and the result is cached for the life of the
+    process.
+    """
+    if environ.get("NOBROWSER"):
+        return None
+
     # Avoid text-mode browsers
     TERM = environ.pop("TERM", None)
     try:
-        BROWSER = webbrowser.get()
+        return webbrowser.get()
     except:
-        BROWSER = None
+        return None
     finally:
         if TERM is not None:
             environ["TERM"] = TERM
@@ -55,7 +65,9 @@ def open_browser(url: Union[str, URL], new_thread: bool = True):
     launched, as automatically opening a browser is considered a
     nice-but-not-necessary feature.
     """
-    if not BROWSER:
+    browser = get_browser()
+
+    if not browser:
         warn(f"Couldn't open <{url}> in browser: no browser found")
         return
 
@@ -64,6 +76,6 @@ def open_browser(url: Union[str, URL], new_thread: bool = True):
             Thread(target = open_browser, args = (str(url), False), daemon = True).start()
         else:
             # new = 2 means new tab, if possible
-            BROWSER.open(str(url), new = 2, autoraise = True)
+            browser.open(str(url), new = 2, autoraise = True)
     except (ThreadError, webbrowser.Error) as err:
         warn(f"Couldn't open <{url}> in browser: {err!r}")
@@ -46,17 +46,19 @@ be ignored for the purposes of finding available narratives.
 """
 
 from multiprocessing import Process, ProcessError
-import re
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from inspect import cleandoc
-from os import environ
+from ipaddress import ip_address
+from os import environ, name as os_name, scandir
 from pathlib import Path
-from socket import getaddrinfo, AddressFamily, SocketKind, AF_INET, AF_INET6, IPPROTO_TCP
+from socket import getaddrinfo, AF_INET, AF_INET6, IPPROTO_TCP
+from threading import Thread, ThreadError
 from time import sleep, time
-from typing import Iterable, NamedTuple, Tuple, Union
+from typing import Container, Iterable, List, Tuple
 from .. import runner
 from ..argparse import add_extended_help_flags, SUPPRESS, SKIP_AUTO_DEFAULT_IN_HELP
-from ..browser import BROWSER, open_browser as __open_browser
+from ..browser import get_browser, open_browser as __open_browser
 from ..runner import docker, ambient, conda, singularity
 from ..util import colored, remove_suffix, warn
 from ..volume import NamedVolume
@@ -67,7 +69,21 @@ HOST = environ.get("HOST") or "127.0.0.1"
 PORT = environ.get("PORT") or "4000"
 
 
-OPEN_DEFAULT = bool(BROWSER)
+# Endings of dataset sidecar and v1 files, which aren't v2 datasets themselves.
+#
+# Note that here "sidecar" is used to describe suffixes which include Augur
+# "node data" files, though those aren't true dataset sidecars.  The list below
+# also doesn't include all such known suffixes; see
+# <https://docs.nextstrain.org/en/latest/reference/data-formats.html> for more
+# examples.
+#   -trs, 11 Jan 2022
+SIDECAR_ENDINGS = tuple(
+    f"_{suffix}.json"
+        for suffix in ["meta", "tree", "root-sequence", "seq", "sequences", "tip-frequencies", "measurements", "entropy"])
+
+
+# Markdown files which are, by convention, not narratives.
+NARRATIVE_EXCLUDES = frozenset({"README.md", "group-overview.md"})
 
 
 def register_parser(subparser):
@@ -81,19 +97,20 @@ def register_parser(subparser):
     # Support --help and --help-all
     add_extended_help_flags(parser)
 
+    # The default for --open depends on whether a browser is available, but
+    # detecting that is slow enough that we defer it until run() instead of
+    # paying for it on every invocation of every command.
     parser.add_argument(
         "--open",
-        help    = "Open a web browser automatically " +
-                  ('(the default)' if OPEN_DEFAULT else '') +
+        help    = "Open a web browser automatically (the default if a browser is available)" +
                   SKIP_AUTO_DEFAULT_IN_HELP,
         action  = "store_true",
-        default = OPEN_DEFAULT)
+        default = None)
 
     parser.add_argument(
         "--no-open",
         dest    = "open",
-        help    = "Do not open a web browser automatically " +
-                  ('' if OPEN_DEFAULT else '(the default)') +
+        help    = "Do not open a web browser automatically" +
                   SKIP_AUTO_DEFAULT_IN_HELP,
         action  = "store_false")
 
@@ -163,8 +180,18 @@ def run(opts):
         data_dir = opts.path
 
     elif opts.path.is_file():
-        resource_paths = dataset_paths([opts.path]) \
-                      or narrative_paths([opts.path])
+        # A v1 dataset is only recognized alongside its *_meta.json sibling, so
+        # check for just that one file instead of listing the whole directory.
+        siblings = set()
+
+        if opts.path.name.endswith("_tree.json"):
+            meta = opts.path.with_name(remove_suffix("_tree.json", opts.path.name) + "_meta.json")
+
+            if meta.exists():
+                siblings.add(meta.name)
+
+        resource_paths = dataset_paths([opts.path.name], siblings = siblings) \
+                      or narrative_paths([opts.path.name])
 
         if resource_paths:
             default_path = next(iter(resource_paths), None)
@@ -212,9 +239,17 @@ def run(opts):
     else:
         narratives_dir = data_dir
 
-    # Find the available dataset and narrative paths
-    datasets = dataset_paths(datasets_dir.glob("*.json"))
-    narratives = narrative_paths(narratives_dir.glob("*.md"))
+    # Find the available dataset and narrative paths.  Scan the directories
+    # only once if they're the same, and concurrently if they're not, as
+    # listing directories on network filesystems can be slow.
+    if datasets_dir == narratives_dir:
+        dataset_names = narrative_names = file_names(datasets_dir)
+    else:
+        with ThreadPoolExecutor(max_workers = 2) as executor:
+            dataset_names, narrative_names = executor.map(file_names, [datasets_dir, narratives_dir])
+
+    datasets = dataset_paths(dataset_names)
+    narratives = narrative_paths(narrative_names)
 
     available_paths = [
         *sorted(datasets, key = str.casefold),
@@ -283,63 +318,81 @@ def run(opts):
     # Show a helpful message about where to connect
     print_url(host, port, available_paths)
 
+    if opts.open is None:
+        opts.open = bool(get_browser())
+
     if opts.open:
         open_browser(f"http://{host}:{port}/{default_path or ''}")
 
     return runner.run(opts, working_volume = working_volume, extra_env = env)
 
 
-def dataset_paths(paths: Iterable[Path]) -> Iterable[str]:
+def file_names(directory: Path) -> List[str]:
+    """
+    Returns the names of the files in *directory*.
+    """
+    with scandir(directory) as entries:
+        return [entry.name for entry in entries if entry.is_file()]
+
+
+def dataset_paths(names: Iterable[str], siblings: Container[str] = None) -> Iterable[str]:
     """
     Returns a :py:class:`set` of Auspice (not filesystem) paths for datasets in
-    *paths*.
+    the file *names*.
+
+    v1 datasets are only recognized if their ``*_meta.json`` file name is in
+    *siblings*, which defaults to *names* themselves.
+
+    >>> sorted(dataset_paths(["flu_h3n2.json", "flu_h3n2_tip-frequencies.json", "zika_tree.json", "zika_meta.json", "ebola_tree.json", "README.md"]))
+    ['flu/h3n2', 'zika']
+
+    >>> sorted(dataset_paths(["zika_tree.json"], siblings = ["zika_tree.json", "zika_meta.json"]))
+    ['zika']
     """
     # This file matching/organization logic is similar to organize_files() in
     # nextstrain/cli/remote/nextstrain_dot_org.py, but with a slightly
     # different use case.  I considered combining the two, but ultimately
     # deemed it better to just keep them separate for now.
-    #
-    # Note also that here "sidecar" is used to describe suffixes which include
-    # Augur "node data" files, though those aren't true dataset sidecars.  The
-    # list below also doesn't include all such known suffixes; see
-    # <https://docs.nextstrain.org/en/latest/reference/data-formats.html> for
-    # more examples.
     #   -trs, 11 Jan 2022
+    names = list(names)
+
+    if siblings is None:
+        siblings = set(names)
 
-    # v2: All *.json files which don't end with a known sidecar or v1 suffix.
-    sidecar_suffixes = {"meta", "tree", "root-sequence", "seq", "sequences", "tip-frequencies", "measurements", "entropy"}
+    datasets = set()
 
-    def sidecar_file(path):
-        return any(path.name.endswith("_%s.json" % suffix) for suffix in sidecar_suffixes)
+    for name in names:
+        if not name.endswith(".json"):
+            continue
 
-    datasets_v2 = set(
-        path.stem.replace("_", "/")
-            for path in paths
-            if path.match("*.json") and not sidecar_file(path))
+        # v2: All *.json files which don't end with a known sidecar or v1 suffix.
+        if not name.endswith(SIDECAR_ENDINGS):
+            datasets.add(remove_suffix(".json", name).replace("_", "/"))
 
-    # v1: All *_tree.json files with corresponding *_meta.json files.
-    def meta_exists(path):
-        return path.with_name(remove_suffix("_tree.json", path.name) + "_meta.json").exists()
+        # v1: All *_tree.json files with corresponding *_meta.json files.
+        elif name.endswith("_tree.json"):
+            stem = remove_suffix("_tree.json", name)
 
-    datasets_v1 = set(
-        re.sub(r"_tree$", "", path.stem).replace("_", "/")
-            for path in paths
-            if path.match("*_tree.json") and meta_exists(path))
+            if stem + "_meta.json" in siblings:
+                datasets.add(stem.replace("_", "/"))
 
-    return datasets_v2 | datasets_v1
+    return datasets
 
 
-def narrative_paths(paths: Iterable[Path]) -> Iterable[str]:
+def narrative_paths(names: Iterable[str]) -> Iterable[str]:
     """
     Returns a :py:class:`set` of Auspice (not filesystem) paths for narratives
-    in *paths*.
+    in the file *names*.
+
+    >>> sorted(narrative_paths(["README.md", "group-overview.md", "flu_h3n2.md", "flu_h3n2.json"]))
+    ['narratives/flu/h3n2']
     """
     # Narratives: all *.md files except README.md and group-overview.md
     return {
-        "narratives/" + path.stem.replace("_", "/")
-            for path in paths
-             if path.match("*.md")
-            and path.name not in {"README.md", "group-overview.md"}}
+        "narratives/" + remove_suffix(".md", name).replace("_", "/")
+            for name in names
+             if name.endswith(".md")
+            and name not in NARRATIVE_EXCLUDES}
 
 
 def print_url(host, port, available_paths):
@@ -386,35 +439,61 @@ def resolve(host: str, port: str) -> Tuple[str, int]:
 
     IPv4 addresses are preferred, but IPv6 addresses be returned if no IPv4
     addresses are available.
-    """
-    addrs = [AddressInfo(*a) for a in getaddrinfo(host, port, proto = IPPROTO_TCP)]
 
-    ip4 = [a for a in addrs if a.family is AF_INET]
-    ip6 = [a for a in addrs if a.family is AF_INET6]
+    >>> resolve("127.0.0.1", "4000")
+    ('127.0.0.1', 4000)
+    >>> resolve("::1", "4000")
+    ('::1', 4000)
+    """
+    # Skip resolution for the common case of an IP address and valid port
+    # number (e.g. our defaults), which would otherwise still go through the
+    # system's name service machinery.  Anything else, including out of range
+    # ports, is left to getaddrinfo() to handle (or reject) as usual.
+    try:
+        ip, port_number = str(ip_address(host)), int(port)
+    except ValueError:
+        pass
+    else:
+        if 0 <= port_number <= 65535:
+            return (ip, port_number)
 
-    return (ip4[0].sockaddr[0], ip4[0].sockaddr[1]) if ip4 \
-      else (ip6[0].sockaddr[0], ip6[0].sockaddr[1]) if ip6 \
-      else (str(host), int(port))
+    # Return the first IPv4 address as soon as we see it, but remember the
+    # first IPv6 address in case there are no IPv4 addresses.
+    ip6 = None
 
+    for family, _, _, _, sockaddr in getaddrinfo(host, port, proto = IPPROTO_TCP):
+        if family is AF_INET:
+            return (sockaddr[0], sockaddr[1])
+        elif family is AF_INET6 and not ip6:
+            ip6 = (sockaddr[0], sockaddr[1])
 
-class AddressInfo(NamedTuple):
-    family: AddressFamily
-    type: SocketKind
-    proto: int
-    canonname: str
-    sockaddr: Union[Tuple[str, int], Tuple[str, int, int, int]] # (ip, addr, ...)
+    return ip6 or (str(host), int(port))
 
 
 def open_browser(url: str) -> bool:
+    # On POSIX systems, runner.run() replaces our process with exec(3), which
+    # would take any thread of ours down with it, so we need a separate process
+    # to outlive it.  Elsewhere, runner.run() instead waits on a child process,
+    # so a thread suffices and avoids the cost of spawning a whole new Python
+    # interpreter (the only process start method available on Windows).
     try:
-        Process(target = _open_browser, args = (url,), daemon = True).start()
+        if os_name == "posix":
+            Process(target = _open_browser, args = (url,), daemon = True).start()
+        else:
+            # Detect the browser here, in the calling thread, so the thread
+            # only ever sees the cached result.  Detection temporarily removes
+            # TERM from os.environ, which would race with runner.run() copying
+            # the environment for Auspice.
+            get_browser()
+            Thread(target = _open_browser, args = (url,), daemon = True).start()
         return True
-    except ProcessError as err:
+    except (ProcessError, ThreadError) as err:
         warn(f"Couldn't open <{url}> in browser: {err!r}")
         return False
 
 
-# This function runs in a separate process.  The process is started via
+# This function runs in a separate process on POSIX systems (and a separate
+# thread elsewhere; see above).  The process is started via
 # different methods (either forking or spawning) depending on the platform, per
 # multiprocessing defaults (and, in our standalone executable, PyOxidizer
 # defaults).  As the start method impacts what state (e.g. variables, fds, etc)
@@ -425,7 +504,7 @@ def open_browser(url: str) -> bool:
 # ensure we don't mess it up.
 #   -trs, 21 Dec 2022
 def _open_browser(url: str):
-    if not BROWSER:
+    if not get_browser():
         warn(f"Couldn't open <{url}> in browser: no browser found")
         return
 
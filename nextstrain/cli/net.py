@@ -1,9 +1,10 @@
 """
 Network handling.
 """
+from functools import lru_cache
 from ipaddress import ip_address, IPv4Address, IPv6Address
-from typing import Optional, Set, Union
-from socket import getaddrinfo, getnameinfo, gaierror, AddressFamily, AF_UNSPEC, NI_NUMERICHOST
+from typing import FrozenSet, Optional, Union
+from socket import getaddrinfo, gaierror, AddressFamily, AF_UNSPEC
 
 
 def is_loopback(host: Optional[str]) -> Optional[bool]:
@@ -24,15 +25,22 @@ def is_loopback(host: Optional[str]) -> Optional[bool]:
     return all(ip.is_loopback for ip in ips)
 
 
-def resolve_host(host: str, family: AddressFamily = AF_UNSPEC) -> Set[Union[IPv4Address, IPv6Address]]:
+@lru_cache(maxsize = None)
+def resolve_host(host: str, family: AddressFamily = AF_UNSPEC) -> FrozenSet[Union[IPv4Address, IPv6Address]]:
     """
     Resolves a named or numeric *host* to a set of IP addresses.
 
     By default, all IPv4 and IPv6 addresses are resolved, as applicable
     depending on the local IP stack and DNS records for the named host.  A
     specific address family can be chosen by providing *family*.
+
+    Results are cached for the life of the process, as resolution may involve
+    slow DNS lookups.  Resolution errors are not cached.
     """
-    return {
-        ip_address(getnameinfo(sockaddr, NI_NUMERICHOST)[0])
+    # The address in each sockaddr is already numeric, so parse it directly.
+    # IPv6 addresses may include a scope id (e.g. "fe80::1%eth0"), which
+    # ip_address() doesn't accept before Python 3.9, so drop it.
+    return frozenset(
+        ip_address(sockaddr[0].split("%", 1)[0])
             for _, _, _, _, sockaddr
-             in getaddrinfo(host, None, family = family) }
+             in getaddrinfo(host, None, family = family))
@@ -392,7 +392,7 @@ def run(opts, argv, working_volume = None, extra_env: Env = {}, cpus: int = None
         if job.is_running and not log_watcher:
             # Transitioned from waiting → running, so kick off the log watcher.
             if opts.logs:
-                log_watcher = job.log_watcher(consumer = print_job_log)
+                log_watcher = job.log_watcher(consumer = print_job_logs)
                 log_watcher.start()
 
         elif job.is_complete:
@@ -404,8 +404,8 @@ def run(opts, argv, working_volume = None, extra_env: Env = {}, cpus: int = None
                 # The watcher never started, so we probably missed the
                 # transition to running.  Display the whole log now!
                 if opts.logs:
-                    for entry in job.log_entries():
-                        print_job_log(entry)
+                    for entries in job.log_entry_pages():
+                        print_job_logs(entries)
 
             print_stage(
                 "Job %s after %0.1f minutes" % (job.status, job.elapsed_time / 60),
@@ -522,18 +522,25 @@ def print_stage(stage, *args):
     return print(colored("bold", stage), *args)
 
 
-def print_job_log(entry):
+def print_job_logs(entries):
     """
-    Print an AWS Batch job log entry.
+    Print a batch of AWS Batch job log entries with a single write.
+    """
+    print("\n".join(map(format_job_log, entries)))
+
+
+def format_job_log(entry) -> str:
+    """
+    Format an AWS Batch job log entry for printing.
     """
     msg = entry.get("message", "")
     ts = entry.get("timestamp", entry.get("ingestionTime")) # milliseconds since epoch
 
     if ts is not None:
         ts = datetime.fromtimestamp(round(ts / 1000)).astimezone().isoformat()
-        print(f"[batch] [{ts}] {msg}")
+        return f"[batch] [{ts}] {msg}"
     else:
-        print(f"[batch] {msg}")
+        return f"[batch] {msg}"
 
 
 def generate_run_id() -> str:
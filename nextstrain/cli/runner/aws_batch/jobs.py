@@ -6,7 +6,7 @@ import re
 from copy import deepcopy
 from operator import itemgetter
 from time import time
-from typing import Callable, Generator, Iterable, Mapping, Optional
+from typing import Callable, Generator, Iterable, List, Mapping, Optional
 from ... import aws
 from ...errors import UserError
 from ...util import split_image_name
@@ -115,21 +115,21 @@ class JobState:
 
         return s3.object_from_url(url) if url else None
 
-    def log_entries(self) -> Generator[dict, None, None]:
+    def log_entry_pages(self) -> Generator[List[dict], None, None]:
         """
-        Fetch all the CloudWatch log entries for this job.
+        Fetch all the CloudWatch log entries for this job, a page at a time.
 
-        Returns a generator which yields dict objects.
+        Returns a generator which yields lists of dict objects.
         """
         if self.log_stream:
-            yield from logs.fetch_stream(self.log_stream)
+            yield from logs.fetch_stream_pages(self.log_stream)
         else:
             yield from []
 
-    def log_watcher(self, consumer: Callable[[dict], None]) -> logs.LogWatcher:
+    def log_watcher(self, consumer: Callable[[List[dict]], None]) -> logs.LogWatcher:
         """
         Monitor the CloudWatch log stream for this job and call the supplied
-        *consumer* function with each log entry.
+        *consumer* function with each batch of new log entries.
 
         Returns a LogWatcher thread object, which the caller must start().
         """
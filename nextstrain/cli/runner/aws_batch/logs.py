@@ -4,18 +4,24 @@ Log handling for AWS Batch jobs.
 
 import threading
 from botocore.exceptions import ClientError, ConnectionError as BotocoreConnectionError
-from typing import Any, Callable, Dict, Generator, MutableSet # noqa: F401 (it's wrong; we use it in a type comment)
+from typing import Any, Callable, Dict, Generator, List
 from ... import aws
 
 
 LOG_GROUP = "/aws/batch/job"
 MAX_FAILURES = 10
 
+# Seconds between polls for new log entries.  Polling backs off exponentially
+# from the minimum to the maximum while no new entries arrive.
+MIN_POLL_INTERVAL = 0.2
+MAX_POLL_INTERVAL = 5.0
 
-def fetch_stream(stream: str, start_time: int = None) -> Generator[dict, None, None]:
+
+def fetch_stream_pages(stream: str, start_time: int = None) -> Generator[List[dict], None, None]:
     """
-    Fetch all log entries from the named AWS Batch job *stream*.  Returns a
-    generator.
+    Fetch all log entries from the named AWS Batch job *stream*, a page at a
+    time.  Returns a generator which yields a non-empty list of entries for
+    each page.
 
     If the *start_time* argument is given, only entries with timestamps on or
     after the given value are fetched.
@@ -34,24 +40,35 @@ def fetch_stream(stream: str, start_time: int = None) -> Generator[dict, None, N
         query["startTime"] = start_time
 
     for page in log_events.paginate(**query):
-        yield from page.get("events", [])
+        entries = page.get("events", [])
+
+        if entries:
+            yield entries
 
 
 class LogWatcher(threading.Thread):
     """
     Monitor an AWS Batch job log stream and call a supplied function (the
-    *consumer*) with each log entry.
+    *consumer*) with each batch of new log entries.
+
+    The consumer is called once with the list of new entries from each fetch,
+    which lets it amortize its own overhead (e.g. writes to a terminal) across
+    many entries.
 
     This is a Thread.  Call start() to begin monitoring the log stream and
     stop() (and then join()) to stop.
     """
 
-    def __init__(self, stream: str, consumer: Callable[[dict], None]) -> None:
+    def __init__(self, stream: str, consumer: Callable[[List[dict]], None]) -> None:
         super().__init__(name = "log-watcher", daemon = True)
         self.stream   = stream
         self.consumer = consumer
         self.stopped  = threading.Event()
 
+        # Create our client up front, in the calling thread, since boto3's
+        # default session (unlike its clients) isn't thread-safe.
+        self._client  = aws.client_with_default_region("logs")
+
     def stop(self) -> None:
         """
         Tell the log watcher to cease watching for new logs.
@@ -66,38 +83,66 @@ class LogWatcher(threading.Thread):
 
     def run(self) -> None:
         """
-        Watch for new logs and pass each log entry to the "consumer" function.
+        Watch for new logs and pass each batch of new log entries to the
+        "consumer" function.
         """
-
-        # Track the last timestamp we see.  When we fetch_stream() again on the
-        # next iteration, we'll start from that timestamp onwards to avoid
-        # fetching every single page again.  The last event or two will be
-        # still be in the response, but our de-duping will ignore those.
-        last_timestamp = None
-
-        # Keep track of what log entries we've consumed so that we suppress
-        # duplicates.  Duplicates will arise in our stream due to the way we
-        # watch for new entries.
-        consumed = set()    # type: MutableSet
-
-        # How many successful vs failed fetch_stream calls.  If we consistently see
+        # Read the stream forwards from the start.  Each response includes a
+        # token for the position just after the last entry returned, which we
+        # pass back on the next request to get only newer entries.  This avoids
+        # re-fetching entries we've already seen and thus any need to track
+        # them for de-duplication.
+        query: Dict[str, Any] = {
+            "logGroupName": LOG_GROUP,
+            "logStreamName": self.stream,
+            "startFromHead": True,
+        }
+
+        # How many successful vs failed fetches.  If we consistently see
         # failures but we never see a successful attempt, we should raise an exception
         # and stop.
         success_count = 0
         failure_count = 0
 
-        while not self.stopped.wait(0.2):
+        # Poll often while entries are flowing, but back off while the log is
+        # quiet so we don't needlessly spend the account's API request quota.
+        poll_interval = MIN_POLL_INTERVAL
+
+        while True:
+            # Fetch once more after we're told to stop, so we don't miss entries
+            # logged since our last fetch, e.g. the job's final lines.
+            stopping = self.stopped.wait(poll_interval)
+
+            received = False
+
             try:
-                for entry in fetch_stream(self.stream, start_time = last_timestamp):
-                    if entry["eventId"] not in consumed:
-                        consumed.add(entry["eventId"])
+                # Fetch until we've caught up, which is indicated by getting
+                # back the same token we sent.  Pages may be empty before then.
+                while True:
+                    response = self._client.get_log_events(**query)
+
+                    entries = response.get("events", [])
+
+                    if entries:
+                        received = True
+                        self.consumer(entries)
 
-                        last_timestamp = entry["timestamp"]
+                    next_token = response["nextForwardToken"]
 
-                        self.consumer(entry)
+                    if next_token == query.get("nextToken"):
+                        break
+
+                    query["nextToken"] = next_token
             except (ClientError, BotocoreConnectionError):
                 failure_count += 1
                 if failure_count > MAX_FAILURES and not success_count:
                     raise
             else:
                 success_count += 1
+
+            if stopping:
+                break
+
+            if received:
+                poll_interval = MIN_POLL_INTERVAL
+            else:
+                poll_interval = min(poll_interval * 2, MAX_POLL_INTERVAL)
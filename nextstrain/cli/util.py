@@ -48,10 +48,32 @@ def colored(color, text):
 
 
 def remove_prefix(prefix, string):
-    return re.sub('^' + re.escape(prefix), '', string)
+    """
+    Removes *prefix* from the start of *string*, if present.
+
+    Equivalent to :py:meth:`str.removeprefix` (Python 3.9+).
+
+    >>> remove_prefix("ab", "abc")
+    'c'
+    >>> remove_prefix("ab", "cab")
+    'cab'
+    """
+    return string[len(prefix):] if string.startswith(prefix) else string
 
 def remove_suffix(suffix, string):
-    return re.sub(re.escape(suffix) + '$', '', string)
+    """
+    Removes *suffix* from the end of *string*, if present.
+
+    Equivalent to :py:meth:`str.removesuffix` (Python 3.9+).
+
+    >>> remove_suffix("_tree", "flu_tree")
+    'flu'
+    >>> remove_suffix("_tree", "tree_flu")
+    'tree_flu'
+    >>> remove_suffix("", "flu")
+    'flu'
+    """
+    return string[:-len(suffix)] if suffix and string.endswith(suffix) else string
 
 
 def check_for_new_version():